@@ -24,6 +24,7 @@ class MigrationManager:
             Migration.from_file("migrations/3.surrealql"),
             Migration.from_file("migrations/4.surrealql"),
             Migration.from_file("migrations/5.surrealql"),
+            Migration.from_file("migrations/6.surrealql"),
         ]
         self.down_migrations = [
             Migration.from_file(
@@ -33,6 +34,7 @@ class MigrationManager:
             Migration.from_file("migrations/3_down.surrealql"),
             Migration.from_file("migrations/4_down.surrealql"),
             Migration.from_file("migrations/5_down.surrealql"),
+            Migration.from_file("migrations/6_down.surrealql"),
         ]
         self.runner = MigrationRunner(
             up_migrations=self.up_migrations,
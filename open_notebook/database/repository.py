@@ -1,14 +1,26 @@
+import atexit
 import os
+import queue
 from contextlib import contextmanager
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from loguru import logger
 from sblpy.connection import SurrealSyncConnection
 
+SURREAL_POOL_SIZE = int(os.environ.get("SURREAL_POOL_SIZE", 8))
 
-@contextmanager
-def db_connection():
-    connection = SurrealSyncConnection(
+# Idle connections, so each query does not pay for a new socket and
+# authentication handshake. Streamlit runs every rerun on a fresh thread and
+# LangGraph runs sync nodes on short-lived executor threads, so connections
+# are checked out and returned by whichever thread needs one. The sync
+# connection is not thread-safe, so it is only ever used by one thread at a time.
+_pool: "queue.LifoQueue[SurrealSyncConnection]" = queue.LifoQueue(
+    maxsize=SURREAL_POOL_SIZE
+)
+
+
+def _new_connection() -> SurrealSyncConnection:
+    return SurrealSyncConnection(
         host=os.environ["SURREAL_ADDRESS"],
         port=int(os.environ["SURREAL_PORT"]),
         user=os.environ["SURREAL_USER"],
@@ -18,21 +30,89 @@ def db_connection():
         max_size=2.2**20,
         encrypted=False,  # Set to True if using SSL
     )
+
+
+def _close_connection(connection: SurrealSyncConnection) -> None:
     try:
-        yield connection
-    finally:
         connection.socket.close()
+    except Exception:
+        pass
 
 
-def repo_query(query_str: str, vars: Optional[Dict[str, Any]] = None):
-    with db_connection() as connection:
+@atexit.register
+def close_all_connections() -> None:
+    while True:
+        try:
+            connection = _pool.get_nowait()
+        except queue.Empty:
+            return
+        _close_connection(connection)
+
+
+def _checkout() -> Tuple[SurrealSyncConnection, bool]:
+    """Returns an idle pooled connection, or a new one, and whether it was reused."""
+    try:
+        return _pool.get_nowait(), True
+    except queue.Empty:
+        return _new_connection(), False
+
+
+def _checkin(connection: SurrealSyncConnection) -> None:
+    try:
+        _pool.put_nowait(connection)
+    except queue.Full:
+        _close_connection(connection)
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    # Socket failures, as opposed to errors reported by SurrealDB for the query
+    return isinstance(error, (OSError, EOFError)) or type(error).__name__.startswith(
+        "ConnectionClosed"
+    )
+
+
+@contextmanager
+def db_connection():
+    connection, _ = _checkout()
+    try:
+        yield connection
+    except BaseException:
+        # The socket may be left in an unknown state, don't hand it out again
+        _close_connection(connection)
+        raise
+    _checkin(connection)
+
+
+def _pooled_query(query_str: str, vars: Optional[Dict[str, Any]]):
+    connection, reused = _checkout()
+    try:
+        result = connection.query(query_str, vars)
+    except BaseException as e:
+        _close_connection(connection)
+        if not (reused and _is_connection_error(e)):
+            raise
+        # The server may have dropped the idle connection (e.g. SurrealDB was
+        # restarted), in which case the other idle ones are likely dead too.
+        # Discard them and try once more on a new connection.
+        logger.warning(f"Pooled database connection failed ({str(e)}), reconnecting")
+        close_all_connections()
+        connection = _new_connection()
         try:
             result = connection.query(query_str, vars)
-            return result
-        except Exception as e:
-            logger.critical(f"Query: {query_str}")
-            logger.exception(e)
+        except BaseException:
+            _close_connection(connection)
             raise
+    _checkin(connection)
+    return result
+
+
+def repo_query(query_str: str, vars: Optional[Dict[str, Any]] = None):
+    try:
+        return _pooled_query(query_str, vars)
+    except Exception as e:
+        logger.critical(f"Query: {query_str}")
+        logger.exception(e)
+        raise
 
 
 def repo_create(table: str, data: Dict[str, Any]):
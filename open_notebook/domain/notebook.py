@@ -1,4 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
 from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple
 
 from loguru import logger
@@ -11,6 +11,7 @@ from open_notebook.domain.base import ObjectModel
 from open_notebook.domain.models import model_manager
 from open_notebook.exceptions import (
     DatabaseOperationError,
+    ExternalServiceError,
     InvalidInputError,
 )
 from open_notebook.utils import split_text, surreal_clean
@@ -25,7 +26,7 @@ class Notebook(ObjectModel):
     @field_validator("name")
     @classmethod
     def name_must_not_be_empty(cls, v):
-        if not v.strip():
+        if not v or v.isspace():
             raise InvalidInputError("Notebook name cannot be empty")
         return v
 
@@ -139,6 +140,7 @@ class Source(ObjectModel):
     title: Optional[str] = None
     topics: Optional[List[str]] = Field(default_factory=list)
     full_text: Optional[str] = None
+    full_text_hash: Optional[str] = None
 
     def get_context(
         self, context_size: Literal["short", "long"] = "short"
@@ -198,6 +200,19 @@ class Source(ObjectModel):
                 logger.warning(f"No text to vectorize for source {self.id}")
                 return
 
+            # The hash covers the embedding model too, so switching the default
+            # model re-embeds the source
+            text_hash = hashlib.blake2b(digest_size=16)
+            text_hash.update(
+                str(model_manager.defaults.default_embedding_model).encode()
+            )
+            text_hash.update(b"\0")
+            text_hash.update(self.full_text.encode("utf-8"))
+            full_text_hash = text_hash.hexdigest()
+            if full_text_hash == self.full_text_hash and self.embedded_chunks > 0:
+                logger.info(f"Source {self.id} is already vectorized, skipping")
+                return
+
             chunks = split_text(
                 self.full_text,
             )
@@ -208,41 +223,40 @@ class Source(ObjectModel):
                 logger.warning("No chunks created after splitting")
                 return
 
-            def process_chunk(args: Tuple[int, str]) -> Tuple[int, List[float], str]:
-                idx, chunk = args
-                logger.debug(f"Processing chunk {idx}/{chunk_count}")
-                try:
-                    embedding = EMBEDDING_MODEL.embed(chunk)
-                    cleaned_content = surreal_clean(chunk)
-                    logger.debug(f"Successfully processed chunk {idx}")
-                    return (idx, embedding, cleaned_content)
-                except Exception as e:
-                    logger.error(f"Error processing chunk {idx}: {str(e)}")
-                    raise
-
-            # Process chunks in parallel while preserving order
-            logger.info("Starting parallel processing of chunks")
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                # Create list of (index, chunk) tuples
-                chunk_tasks = list(enumerate(chunks))
-                # Process all chunks in parallel and get results
-                results = list(executor.map(process_chunk, chunk_tasks))
-
-            logger.info(f"Parallel processing complete. Got {len(results)} results")
-
-            # Insert results in order (they're already ordered by index)
-            for idx, embedding, content in results:
-                logger.debug(f"Inserting chunk {idx} into database")
-                repo_query(
-                    f"""
+            # Embeddings are requested in batches dispatched concurrently,
+            # and come back in the same order as the chunks
+            logger.info("Starting embedding of chunks")
+            embeddings = EMBEDDING_MODEL.embed_many(chunks)
+            logger.info(f"Embedding complete. Got {len(embeddings)} results")
+            if len(embeddings) != chunk_count:
+                raise ExternalServiceError(
+                    f"Expected {chunk_count} embeddings, got {len(embeddings)}"
+                )
+
+            # Replace any previous chunks and store the new ones atomically,
+            # in a single request regardless of the chunk count
+            chunk_rows = [
+                {"order": idx, "content": surreal_clean(chunk), "embedding": embedding}
+                for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+            ]
+            logger.debug(f"Inserting {len(chunk_rows)} chunks into database")
+            repo_query(
+                f"""
+                BEGIN TRANSACTION;
+                DELETE source_embedding WHERE source={self.id};
+                FOR $chunk IN $chunks {{
                     CREATE source_embedding CONTENT {{
                             "source": {self.id},
-                            "order": {idx},
-                            "content": $content,
-                            "embedding": {embedding},
-                    }};""",
-                    {"content": content},
-                )
+                            "order": $chunk.order,
+                            "content": $chunk.content,
+                            "embedding": $chunk.embedding,
+                    }};
+                }};
+                UPDATE {self.id} SET full_text_hash = $full_text_hash;
+                COMMIT TRANSACTION;""",
+                {"chunks": chunk_rows, "full_text_hash": full_text_hash},
+            )
+            self.full_text_hash = full_text_hash
 
             logger.info(f"Vectorization complete for source {self.id}")
 
@@ -252,26 +266,55 @@ class Source(ObjectModel):
             raise DatabaseOperationError(e)
 
     def add_insight(self, insight_type: str, content: str) -> Any:
+        return self.add_insights([(insight_type, content)])
+
+    def add_insights(self, insights: List[Tuple[str, str]]) -> Any:
+        """
+        Embeds and stores several (insight_type, content) pairs in one request.
+        """
         EMBEDDING_MODEL = model_manager.embedding_model
         if not EMBEDDING_MODEL:
             logger.warning("No embedding model found. Insight will not be searchable.")
 
-        if not insight_type or not content:
-            raise InvalidInputError("Insight type and content must be provided")
+        invalid = [
+            idx
+            for idx, (insight_type, content) in enumerate(insights)
+            if not insight_type or not content
+        ]
+        if invalid:
+            raise InvalidInputError(
+                f"Insight type and content must be provided (invalid items: {invalid})"
+            )
+        if not insights:
+            return []
         try:
-            embedding = EMBEDDING_MODEL.embed(content) if EMBEDDING_MODEL else []
+            embeddings = (
+                EMBEDDING_MODEL.embed_many([content for _, content in insights])
+                if EMBEDDING_MODEL
+                else [[] for _ in insights]
+            )
+            insight_rows = [
+                {
+                    "insight_type": insight_type,
+                    "content": surreal_clean(content),
+                    "embedding": embedding,
+                }
+                for (insight_type, content), embedding in zip(insights, embeddings)
+            ]
             return repo_query(
                 f"""
-                CREATE source_insight CONTENT {{
-                        "source": {self.id},
-                        "insight_type": '{insight_type}',
-                        "content": $content,
-                        "embedding": {embedding},
+                FOR $insight IN $insights {{
+                    CREATE source_insight CONTENT {{
+                            "source": {self.id},
+                            "insight_type": $insight.insight_type,
+                            "content": $insight.content,
+                            "embedding": $insight.embedding,
+                    }};
                 }};""",
-                {"content": surreal_clean(content)},
+                {"insights": insight_rows},
             )
         except Exception as e:
-            logger.error(f"Error adding insight to source {self.id}: {str(e)}")
+            logger.error(f"Error adding insights to source {self.id}: {str(e)}")
             raise  # DatabaseOperationError(e)
 
 
@@ -284,7 +327,7 @@ class Note(ObjectModel):
     @field_validator("content")
     @classmethod
     def content_must_not_be_empty(cls, v):
-        if v is not None and not v.strip():
+        if v is not None and (not v or v.isspace()):
             raise InvalidInputError("Note content cannot be empty")
         return v
 
@@ -323,7 +366,7 @@ class ChatSession(ObjectModel):
 
 
 def text_search(keyword: str, results: int, source: bool = True, note: bool = True):
-    if not keyword:
+    if not keyword or keyword.isspace():
         raise InvalidInputError("Search keyword cannot be empty")
     try:
         results = repo_query(
@@ -347,7 +390,7 @@ def vector_search(
     note: bool = True,
     minimum_score=0.2,
 ):
-    if not keyword:
+    if not keyword or keyword.isspace():
         raise InvalidInputError("Search keyword cannot be empty")
     try:
         EMBEDDING_MODEL = model_manager.embedding_model
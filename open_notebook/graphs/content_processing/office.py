@@ -8,11 +8,11 @@ from pptx import Presentation
 
 from open_notebook.graphs.content_processing.state import ContentState
 
-SUPPORTED_OFFICE_TYPES = [
+SUPPORTED_OFFICE_TYPES = (
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
     "application/vnd.openxmlformats-officedocument.presentationml.presentation",
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-]
+)
 
 
 async def extract_docx_content_detailed(file_path):
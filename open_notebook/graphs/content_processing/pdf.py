@@ -20,10 +20,10 @@ from open_notebook.graphs.content_processing.state import ContentState
 #     doc.close()
 #     return text
 
-SUPPORTED_FITZ_TYPES = [
+SUPPORTED_FITZ_TYPES = (
     "application/pdf",
     "application/epub+zip",
-]
+)
 
 
 def clean_pdf_text(text):
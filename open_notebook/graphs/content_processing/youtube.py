@@ -13,6 +13,8 @@ from open_notebook.graphs.content_processing.state import ContentState
 
 ssl._create_default_https_context = ssl._create_unverified_context
 
+DEFAULT_PREFERRED_LANGUAGES = ("en", "es", "pt")
+
 
 async def get_video_title(video_id):
     try:
@@ -67,7 +69,7 @@ def _extract_youtube_id(url):
     return match.group(1) if match else None
 
 
-async def get_best_transcript(video_id, preferred_langs=["en", "es", "pt"]):
+async def get_best_transcript(video_id, preferred_langs=DEFAULT_PREFERRED_LANGUAGES):
     try:
         transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
 
@@ -139,7 +141,7 @@ async def extract_youtube_transcript(state: ContentState):
     """
 
     languages = CONFIG.get("youtube_transcripts", {}).get(
-        "preferred_languages", ["en", "es", "pt"]
+        "preferred_languages", DEFAULT_PREFERRED_LANGUAGES
     )
 
     video_id = _extract_youtube_id(state.get("url"))
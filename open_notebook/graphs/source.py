@@ -11,6 +11,7 @@ from typing_extensions import Annotated, TypedDict
 
 from open_notebook.domain.notebook import Asset, Source
 from open_notebook.domain.transformation import Transformation
+from open_notebook.exceptions import ExternalServiceError
 from open_notebook.graphs.content_processing import ContentState
 from open_notebook.graphs.content_processing import graph as content_graph
 from open_notebook.graphs.transformation import graph as transform_graph
@@ -23,6 +24,7 @@ class SourceState(TypedDict):
     notebook_id: str
     source: Source
     transformation: Annotated[list, operator.add]
+    failed_transformations: Annotated[list, operator.add]
     embed: bool
 
 
@@ -88,20 +90,49 @@ async def transform_content(state: TransformationState) -> Optional[dict]:
     transformation: Transformation = state["transformation"]
 
     logger.debug(f"Applying transformation {transformation.name}")
-    result = await transform_graph.ainvoke(
-        dict(input_text=content, transformation=transformation)
-    )
-    source.add_insight(transformation.title, surreal_clean(result["output"]))
+    try:
+        result = await transform_graph.ainvoke(
+            dict(input_text=content, transformation=transformation)
+        )
+    except Exception as e:
+        # Insights are saved together after all branches finish, so a failing
+        # transformation must not discard the output of the others. The failure
+        # is reported by save_insights once those are stored.
+        logger.error(f"Error applying transformation {transformation.name}: {str(e)}")
+        logger.exception(e)
+        return {"failed_transformations": [transformation.name]}
     return {
         "transformation": [
             {
                 "output": result["output"],
                 "transformation_name": transformation.name,
+                "insight_type": transformation.title,
             }
         ]
     }
 
 
+def save_insights(state: SourceState) -> dict:
+    source = state["source"]
+    insights = []
+    for t in state.get("transformation", []):
+        output = surreal_clean(t["output"]) if t["output"] else ""
+        if not output or output.isspace():
+            logger.warning(
+                f"Transformation {t['transformation_name']} returned no content"
+            )
+            continue
+        insights.append((t["insight_type"], output))
+    source.add_insights(insights)
+
+    failed = state.get("failed_transformations", [])
+    if failed:
+        raise ExternalServiceError(
+            f"Failed to apply transformations: {', '.join(failed)}"
+        )
+    return {}
+
+
 # Create and compile the workflow
 workflow = StateGraph(SourceState)
 
@@ -109,13 +140,15 @@ workflow = StateGraph(SourceState)
 workflow.add_node("content_process", content_process)
 workflow.add_node("save_source", save_source)
 workflow.add_node("transform_content", transform_content)
+workflow.add_node("save_insights", save_insights)
 # Define the graph edges
 workflow.add_edge(START, "content_process")
 workflow.add_edge("content_process", "save_source")
 workflow.add_conditional_edges(
     "save_source", trigger_transformations, ["transform_content"]
 )
-workflow.add_edge("transform_content", END)
+workflow.add_edge("transform_content", "save_insights")
+workflow.add_edge("save_insights", END)
 
 # Compile the graph
 source_graph = workflow.compile()
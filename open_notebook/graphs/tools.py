@@ -1,4 +1,4 @@
-from datetime import datetime
+import time
 
 from langchain.tools import tool
 
@@ -10,4 +10,4 @@ def get_current_timestamp() -> str:
     name: get_current_timestamp
     Returns the current timestamp in the format YYYYMMDDHHmmss.
     """
-    return datetime.now().strftime("%Y%m%d%H%M%S")
+    return time.strftime("%Y%m%d%H%M%S")
@@ -1,3 +1,5 @@
+from typing import Dict, Tuple
+
 from langchain_core.language_models.chat_models import BaseChatModel
 from loguru import logger
 
@@ -5,6 +7,13 @@ from open_notebook.domain.models import model_manager
 from open_notebook.models.llms import LanguageModel
 from open_notebook.utils import token_count
 
+LARGE_CONTEXT_THRESHOLD = 105_000
+
+# LangChain clients already built for each cached LanguageModel instance, keyed
+# by id() since the dataclasses aren't hashable. The model is kept alongside so
+# its id can't be reused while the entry exists.
+_langchain_models: Dict[int, Tuple[LanguageModel, BaseChatModel]] = {}
+
 
 def provision_langchain_model(
     content, model_id, default_type, **kwargs
@@ -15,9 +24,11 @@ def provision_langchain_model(
     If model_id is specified in Config, returns that model
     Otherwise, returns the default model for the given type
     """
-    tokens = token_count(content)
+    # Every token covers at least one UTF-8 byte and a character takes at most
+    # four, so shorter content can't reach the threshold and isn't tokenized
+    tokens = token_count(content) if len(content) * 4 > LARGE_CONTEXT_THRESHOLD else 0
 
-    if tokens > 105_000:
+    if tokens > LARGE_CONTEXT_THRESHOLD:
         logger.debug(
             f"Using large context model because the content has {tokens} tokens"
         )
@@ -28,4 +39,10 @@ def provision_langchain_model(
         model = model_manager.get_default_model(default_type, **kwargs)
 
     assert isinstance(model, LanguageModel), f"Model is not a LanguageModel: {model}"
-    return model.to_langchain()
+    cached = _langchain_models.get(id(model))
+    if cached and cached[0] is model:
+        return cached[1]
+
+    langchain_model = model.to_langchain()
+    _langchain_models[id(model)] = (model, langchain_model)
+    return langchain_model
@@ -5,13 +5,66 @@ Classes for supporting different embedding models
 from __future__ import annotations
 
 import os
+import random
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import cached_property
+from typing import Dict, List, Optional
 
 import requests
+from loguru import logger
 
-# todo: add support for multiple embeddings (array)
+EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", 50))
+EMBEDDING_MAX_CONCURRENCY = int(os.environ.get("EMBEDDING_MAX_CONCURRENCY", 8))
+EMBEDDING_MAX_RETRIES = int(os.environ.get("EMBEDDING_MAX_RETRIES", 3))
+EMBEDDING_RETRY_BASE_DELAY = float(os.environ.get("EMBEDDING_RETRY_BASE_DELAY", 1))
+EMBEDDING_RETRY_MAX_DELAY = float(os.environ.get("EMBEDDING_RETRY_MAX_DELAY", 30))
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Whether a failed request is worth retrying: rate limits, server errors,
+    timeouts and dropped connections. Errors such as a bad API key or an
+    oversized input fail the same way every time.
+    """
+    if isinstance(
+        error,
+        (TimeoutError, ConnectionError, requests.Timeout, requests.ConnectionError),
+    ):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    if isinstance(status, int):
+        return status in (408, 429) or status >= 500
+    # Client libraries wrap network failures in their own types with no status
+    # (openai.APIConnectionError, httpx.TimeoutException, ...)
+    return any(
+        cls.__name__
+        in ("APIConnectionError", "APITimeoutError", "TimeoutException", "NetworkError")
+        for cls in type(error).__mro__
+    )
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed request. Honors the Retry-After
+    header when the provider sends one, otherwise uses exponential backoff with
+    jitter so concurrent batches don't retry in lockstep.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(float(retry_after), EMBEDDING_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    delay = min(EMBEDDING_RETRY_BASE_DELAY * (2**attempt), EMBEDDING_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.5, 1.5)
 
 
 @dataclass
@@ -29,22 +82,100 @@ class EmbeddingModel(ABC):
         """
         raise NotImplementedError
 
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generates the embeddings for a single batch of texts
+        """
+        return [self.embed(text) for text in texts]
+
+    def _embed_batch_with_retry(self, texts: List[str]) -> List[List[float]]:
+        retries = max(EMBEDDING_MAX_RETRIES, 0)
+        last_error: Optional[Exception] = None
+        for attempt in range(retries + 1):
+            try:
+                return self.embed_batch(texts)
+            except Exception as e:
+                if not _is_transient(e):
+                    raise
+                last_error = e
+                if attempt < retries:
+                    delay = _retry_delay(e, attempt)
+                    logger.warning(
+                        f"Embedding request failed ({str(e)}), retrying in {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+        assert last_error is not None
+        raise last_error
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generates the embeddings for several texts, preserving their order.
+        Texts are split in batches that are sent to the provider concurrently.
+        """
+        if not texts:
+            return []
+
+        # Identical texts (repeated headers, footers, etc) are embedded only once
+        positions: Dict[str, int] = {}
+        indexes = [positions.setdefault(text, len(positions)) for text in texts]
+        if len(positions) == len(texts):
+            return self._embed_distinct(texts)
+        unique_embeddings = self._embed_distinct(list(positions))
+        return [unique_embeddings[i] for i in indexes]
+
+    def _embed_distinct(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) <= EMBEDDING_BATCH_SIZE:
+            return self._embed_batch_with_retry(texts)
+
+        # Batch texts of similar length together, so providers that pad each
+        # batch to its longest member don't waste work on the shorter ones
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_texts = [texts[i] for i in order]
+        batches = [
+            sorted_texts[i : i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(sorted_texts), EMBEDDING_BATCH_SIZE)
+        ]
+
+        workers = min(EMBEDDING_MAX_CONCURRENCY, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._embed_batch_with_retry, batches))
+
+        embeddings: List[List[float]] = [[] for _ in texts]
+        sorted_embeddings = (embedding for batch in results for embedding in batch)
+        for position, embedding in zip(order, sorted_embeddings):
+            embeddings[position] = embedding
+        return embeddings
+
 
 @dataclass
 class OllamaEmbeddingModel(EmbeddingModel):
     model_name: str
     base_url: str = os.environ.get("OLLAMA_API_BASE", "http://localhost:11434")
 
+    @cached_property
+    def session(self) -> requests.Session:
+        # Keeps the HTTP connection to Ollama alive between requests
+        return requests.Session()
+
     def embed(self, text: str) -> List[float]:
         """
-        Embeds the content using Open AI embedding
+        Embeds the content using Ollama embedding
+        """
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds all texts with a single Ollama request
         """
-        text = text.replace("\n", " ")
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/api/embed",
-            json={"model": self.model_name, "input": [text]},
+            json={
+                "model": self.model_name,
+                "input": [text.replace("\n", " ") for text in texts],
+            },
         )
-        return response.json()["embeddings"][0]
+        response.raise_for_status()
+        return response.json()["embeddings"]
 
 
 @dataclass
@@ -52,53 +183,89 @@ class GeminiEmbeddingModel(EmbeddingModel):
     model_name: str
 
     def embed(self, text: str) -> List[float]:
-        import google.generativeai as genai
+        """
+        Embeds the content using Gemini embedding
+        """
+        return self.embed_batch([text])[0]
 
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
-        Embeds the content using Open AI embedding
+        Embeds all texts with a single Gemini request
         """
+        import google.generativeai as genai
+
         model_name = (
             self.model_name
             if self.model_name.startswith("models/")
             else f"models/{self.model_name}"
         )
-        result = genai.embed_content(model=model_name, content=text)
+        result = genai.embed_content(model=model_name, content=texts)
 
         return result["embedding"]
 
 
+# Vertex caps each request at 250 inputs and 20k tokens, well below a full
+# embedding batch of ~500 token chunks
+VERTEX_EMBEDDING_BATCH_SIZE = 16
+
+
 @dataclass
 class VertexEmbeddingModel(EmbeddingModel):
     model_name: str
 
+    @cached_property
+    def model(self):
+        from vertexai.language_models import TextEmbeddingModel
+
+        return TextEmbeddingModel.from_pretrained(self.model_name)
+
     def embed(self, text: str) -> List[float]:
-        from vertexai.language_models import TextEmbeddingInput, TextEmbeddingModel
+        """
+        Embeds the content using Vertex AI embedding
+        """
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds the texts with as few Vertex AI requests as its limits allow
+        """
+        from vertexai.language_models import TextEmbeddingInput
 
-        texts = [text]
         # The dimensionality of the output embeddings.
         # dimensionality = 256
         # The task type for embedding. Check the available tasks in the model's documentation.
-        model = TextEmbeddingModel.from_pretrained(self.model_name)
-        inputs = [TextEmbeddingInput(text) for text in texts]
-        embeddings = model.get_embeddings(inputs)
-        return embeddings[0].values
+        results: List[List[float]] = []
+        for i in range(0, len(texts), VERTEX_EMBEDDING_BATCH_SIZE):
+            inputs = [
+                TextEmbeddingInput(text)
+                for text in texts[i : i + VERTEX_EMBEDDING_BATCH_SIZE]
+            ]
+            embeddings = self.model.get_embeddings(inputs)
+            results.extend(embedding.values for embedding in embeddings)
+        return results
 
 
 @dataclass
 class OpenAIEmbeddingModel(EmbeddingModel):
     model_name: str
 
-    def embed(self, text: str) -> List[float]:
+    @cached_property
+    def client(self):
         from openai import OpenAI
 
+        return OpenAI()
+
+    def embed(self, text: str) -> List[float]:
         """
         Embeds the content using Open AI embedding
         """
-        # todo: make this Singleton
-        client = OpenAI()
-        text = text.replace("\n", " ")
-        return (
-            client.embeddings.create(input=[text], model=self.model_name)
-            .data[0]
-            .embedding
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds all texts with a single Open AI request
+        """
+        response = self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts], model=self.model_name
         )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
@@ -1,6 +1,8 @@
 import re
 import unicodedata
+from functools import lru_cache
 from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
 from urllib.parse import urlparse
 
 import requests
@@ -8,6 +10,17 @@ import tomli
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from packaging.version import parse as parse_version
 
+UNICODE_SPACES_RE = re.compile(r"[\u2000-\u200B\u202F\u205F\u3000]")
+LINE_TERMINATORS_RE = re.compile(r"[\u2028\u2029\r]")
+DISALLOWED_CHARS_RE = re.compile(r"[^\w\s.,!?\-\n\t]", flags=re.UNICODE)
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
 
 def token_count(input_string) -> int:
     """
@@ -19,9 +32,9 @@ def token_count(input_string) -> int:
     Returns:
         int: The number of tokens in the input string.
     """
-    import tiktoken
-
-    encoding = tiktoken.get_encoding("o200k_base")
+    # split_text calls this for every candidate chunk, so the encoding is
+    # looked up once instead of on each call
+    encoding = _get_encoding("o200k_base")
     tokens = encoding.encode(input_string)
     token_count = len(tokens)
     return token_count
@@ -77,26 +90,45 @@ def split_text(txt: str, chunk_size=500):
 
 
 def remove_non_ascii(text) -> str:
-    return re.sub(r"[^\x00-\x7F]+", "", text)
+    if text.isascii():
+        return text
+    return text.encode("ascii", "ignore").decode("ascii")
+
+
+class _ControlCharTable(dict):
+    """
+    str.translate table that deletes control characters (Unicode category C),
+    except newlines and tabs. Code points are classified the first time they
+    are seen, since a table of the whole Unicode range would be huge.
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        if unicodedata.category(char)[0] == "C" and char not in "\n\t":
+            self[codepoint] = None
+        else:
+            self[codepoint] = codepoint
+        return self[codepoint]
+
+
+_control_chars = _ControlCharTable()
 
 
 def remove_non_printable(text) -> str:
     # Replace any special Unicode whitespace characters with a regular space
-    text = re.sub(r"[\u2000-\u200B\u202F\u205F\u3000]", " ", text)
+    text = UNICODE_SPACES_RE.sub(" ", text)
 
     # Replace unusual line terminators with a single newline
-    text = re.sub(r"[\u2028\u2029\r]", "\n", text)
+    text = LINE_TERMINATORS_RE.sub("\n", text)
 
     # Remove control characters, except newlines and tabs
-    text = "".join(
-        char for char in text if unicodedata.category(char)[0] != "C" or char in "\n\t"
-    )
+    text = text.translate(_control_chars)
 
     # Replace non-breaking spaces with regular spaces
     text = text.replace("\xa0", " ").strip()
 
     # Keep letters (including accented ones), numbers, spaces, newlines, tabs, and basic punctuation
-    return re.sub(r"[^\w\s.,!?\-\n\t]", "", text, flags=re.UNICODE)
+    return DISALLOWED_CHARS_RE.sub("", text)
 
 
 def surreal_clean(text) -> str:
@@ -208,6 +240,10 @@ def compare_versions(version1: str, version2: str) -> int:
               0 if version1 == version2
               1 if version1 > version2
     """
+    # The common case (installed version is the latest) needs no parsing
+    if version1 == version2:
+        return 0
+
     v1 = parse_version(version1)
     v2 = parse_version(version2)
 
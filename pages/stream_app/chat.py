@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Union
 
 import humanize
@@ -17,6 +18,13 @@ from pages.stream_app.utils import (
 from .note import make_note_from_chat
 
 
+# Streamlit reruns the page on every interaction, so the sidebar would otherwise
+# tokenize the same context again each time
+@lru_cache(maxsize=8)
+def context_token_count(context_text: str) -> int:
+    return token_count(context_text)
+
+
 # todo: build a smarter, more robust context manager function
 def build_context(notebook_id):
     st.session_state[notebook_id]["context"] = dict(note=[], source=[])
@@ -63,7 +71,7 @@ def execute_chat(txt_input, context, current_session):
 
 def chat_sidebar(current_notebook: Notebook, current_session: ChatSession):
     context = build_context(notebook_id=current_notebook.id)
-    tokens = token_count(
+    tokens = context_token_count(
         str(context) + str(st.session_state[current_session.id]["messages"])
     )
     chat_tab, podcast_tab = st.tabs(["Chat", "Podcast"])
@@ -28,9 +28,12 @@ def version_sidebar():
                 pyproject = tomli.load(f)
                 current_version = pyproject["tool"]["poetry"]["version"]
 
-        latest_version = get_version_from_github(
-            "https://www.github.com/lfnovo/open-notebook", "main"
-        )
+        # Fetched once per session, every page rerun calls this
+        if "latest_version" not in st.session_state:
+            st.session_state["latest_version"] = get_version_from_github(
+                "https://www.github.com/lfnovo/open-notebook", "main"
+            )
+        latest_version = st.session_state["latest_version"]
         st.write(f"Open Notebook: {current_version}")
         if compare_versions(current_version, latest_version) < 0:
             st.warning(